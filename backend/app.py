@@ -1,16 +1,29 @@
 import os
 import json
-import requests
+import logging
+import logging.handlers
+import asyncio
+import functools
+import hashlib
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from queue import SimpleQueue
+import httpx
+import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict
 from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from google import genai
 from google.genai import types
-import re
+from google.genai import errors as genai_errors
+from aiolimiter import AsyncLimiter
 
 # ==========================================
 # 🔐 CONFIGURATION
@@ -39,8 +52,87 @@ STRATEGY_2_MULTI_NO_MIN = 70   # Buy NO on favorites priced 70-95¢
 STRATEGY_2_MULTI_NO_MAX = 95   # (means YES is 5-30¢ - longshot territory)
 
 MAX_RESULTS = 20
+VERIFY_CONCURRENCY = 3  # Parallel Gemini verifications in /strategy1/verify_top3
+
+# Logging (DEBUG adds per-thought / per-search lines)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Kalshi HTTP client
+KALSHI_MAX_CONNECTIONS = 100
+KALSHI_MAX_KEEPALIVE = 20
+KALSHI_DETAIL_WORKERS = 16  # Concurrent /markets batch fetchers per scan
+KALSHI_QUEUE_MAXSIZE = 500  # Event batches listed but not yet fetched
+KALSHI_MARKETS_BATCH = 10  # Event tickers per /markets call (Kalshi's cap for event_ticker lists)
+
+# Batch triage: tickers per single Flash call
+TRIAGE_BATCH_MAX = 20
+TRIAGE_SENTIMENTS = {"BULLISH", "BEARISH", "NEUTRAL"}
+
+# Gemini throttling (tune to your API tier)
+GEMINI_MAX_CONCURRENCY = 8
+GEMINI_MAX_RPM = 450
+GEMINI_MAX_RETRIES = 3
+
+# Chart uploads larger than this go through the Gemini Files API instead of inline bytes
+CHART_INLINE_MAX_BYTES = 1024 * 1024
+
+# Dedicated threads for blocking yfinance calls
+YF_MAX_WORKERS = 32
+
+# Load shedding: concurrent /analyze_stock requests before answering 503
+ANALYZE_MAX_IN_FLIGHT = 10
+
+# Cache TTLs (seconds)
+PRICE_CACHE_TTL = 30
+NEWS_CACHE_TTL = 60
+ANALYSIS_CACHE_TTL = 300
+HISTORY_CACHE_TTL_INTRADAY = 60
+HISTORY_CACHE_TTL_DAILY = 3600
+KALSHI_LIST_CACHE_TTL = 30
+KALSHI_DETAIL_CACHE_TTL = 60
+KALSHI_DETAIL_CACHE_TTL_0DTE = 15  # Events with a market closing today move fastest
+INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
 
-app = FastAPI(title="Dual-Engine Trading Strategy")
+# ==========================================
+# 📝 LOGGING
+# ==========================================
+# Handlers hand records to a queue; a background listener thread does the actual
+# stderr writes, so logging from a handler never blocks the event loop on I/O.
+# The listener runs for the app's lifespan; records logged outside it wait in the queue.
+logger = logging.getLogger(__name__)
+logger.setLevel(LOG_LEVEL)
+logger.propagate = False
+
+_log_queue: SimpleQueue = SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the log listener and the shared keep-alive Kalshi client for the lifetime of the app"""
+    app.state.kalshi_client = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,  # Multiplex the /markets fetches over a few connections
+            retries=3,  # Retry failed connects
+            limits=httpx.Limits(
+                max_keepalive_connections=KALSHI_MAX_KEEPALIVE,
+                max_connections=KALSHI_MAX_CONNECTIONS,
+            ),
+        ),
+        timeout=httpx.Timeout(10.0),
+    )
+    _log_listener.start()
+    try:
+        yield
+    finally:
+        await app.state.kalshi_client.aclose()
+        _log_listener.stop()
+
+
+app = FastAPI(title="Dual-Engine Trading Strategy", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 # ==========================================
@@ -68,12 +160,214 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 if not GOOGLE_API_KEY:
     raise ValueError("⚠️ GOOGLE_API_KEY environment variable must be set")
 
-# Initialize Gemini Client
-try:
-    client = genai.Client(api_key=GOOGLE_API_KEY)
-except Exception as e:
-    print(f"⚠️ Warning: Gemini Client failed to initialize. {e}")
-    client = None
+# Initialize Gemini Client (one per event loop: the SDK's async HTTP session is bound to its loop)
+_clients_by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, genai.Client]" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> Optional[genai.Client]:
+    """Gemini client for the running event loop, created on first use and reused afterwards"""
+    loop = asyncio.get_running_loop()
+    client = _clients_by_loop.get(loop)
+    if client is None:
+        try:
+            client = genai.Client(api_key=GOOGLE_API_KEY)
+        except Exception as e:
+            logger.warning("⚠️ Gemini Client failed to initialize: %s", e)
+            return None
+        _clients_by_loop[loop] = client
+    return client
+
+
+def _require_client() -> genai.Client:
+    """get_client(), failing the request if the client could not be created"""
+    client = get_client()
+    if client is None:
+        raise HTTPException(500, "Gemini client not initialized")
+    return client
+
+
+# Proactive throttling: cap in-flight calls and requests/minute instead of eating 429s
+GEMINI_SEM = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+GEMINI_RATE = AsyncLimiter(max_rate=GEMINI_MAX_RPM, time_period=60)
+
+
+def _retry_after_seconds(error: genai_errors.APIError, attempt: int) -> float:
+    """Delay requested by the server's Retry-After header, else exponential backoff"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return float(2 ** attempt)
+
+
+async def _gemini_request(call):
+    """Issue one Gemini request under the rate limiter, retrying 429s"""
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        await GEMINI_RATE.acquire()
+        try:
+            return await call()
+        except genai_errors.APIError as e:
+            if e.code != 429 or attempt == GEMINI_MAX_RETRIES:
+                raise
+            delay = _retry_after_seconds(e, attempt)
+            logger.info("⏳ Gemini rate limited, retrying in %.1fs", delay)
+            await asyncio.sleep(delay)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str, opener: str = "{"):
+    """Decode the first JSON value starting at `opener`; tolerates ``` fences and trailing text"""
+    start = text.find(opener)
+    if start < 0:
+        raise ValueError(f"No JSON {opener!r} found in model output")
+    obj, _ = _JSON_DECODER.raw_decode(text, start)
+    return obj
+
+
+def limit_in_flight(max_in_flight: int, retry_after: int = 5):
+    """Endpoint decorator: fail fast with 503 once `max_in_flight` calls are already running"""
+    in_flight = asyncio.Semaphore(max_in_flight)
+    
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            if in_flight.locked():
+                raise HTTPException(503, "Server busy, please retry shortly", headers={"Retry-After": str(retry_after)})
+            async with in_flight:
+                return await endpoint(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def _gemini_generate(**kwargs):
+    """Throttled client.aio.models.generate_content"""
+    async with GEMINI_SEM:
+        client = _require_client()
+        return await _gemini_request(lambda: client.aio.models.generate_content(**kwargs))
+
+
+async def _gemini_generate_stream(**kwargs):
+    """
+    Throttled client.aio.models.generate_content_stream; the slot is held until the stream ends.
+    The stream is lazy (the request goes out on the first read), so 429s are retried up to the
+    first chunk; an error after chunks have been yielded is not retried.
+    """
+    async with GEMINI_SEM:
+        client = _require_client()
+        
+        async def open_stream():
+            stream = await client.aio.models.generate_content_stream(**kwargs)
+            try:
+                return stream, await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, None
+        
+        stream, first = await _gemini_request(open_stream)
+        if first is None:
+            return
+        yield first
+        async for chunk in stream:
+            yield chunk
+
+
+# yfinance is blocking: give it its own pool so slow Yahoo calls can't starve the
+# default executor FastAPI/Starlette use for sync routes and file I/O (and vice versa)
+_YF_POOL = ThreadPoolExecutor(max_workers=YF_MAX_WORKERS, thread_name_prefix="yf")
+
+
+def _run_yf(fn, *args):
+    """Schedule a blocking yfinance call on the dedicated pool; returns an awaitable future"""
+    return asyncio.get_running_loop().run_in_executor(_YF_POOL, fn, *args)
+
+
+# ==========================================
+# 🗄️ IN-PROCESS CACHES
+# ==========================================
+CACHES: Dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: Dict[object, tuple] = {}  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        CACHES[name] = self
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Drop expired entries first, then the oldest insertions
+                for k in [k for k, (exp, _) in self._data.items() if exp <= now]:
+                    del self._data[k]
+                while len(self._data) >= self.maxsize:
+                    del self._data[next(iter(self._data))]
+            self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+# Last-trade prices, keyed by upper-cased ticker
+PRICE_CACHE = TTLCache("price", ttl=PRICE_CACHE_TTL)
+# (headlines, joined summary), keyed by upper-cased ticker
+NEWS_CACHE = TTLCache("news", ttl=NEWS_CACHE_TTL)
+# Chart series, keyed by "TICKER:period:interval"; TTL chosen per interval at insert time
+HISTORY_CACHE = TTLCache("history", ttl=HISTORY_CACHE_TTL_DAILY, maxsize=512)
+# Finished StockTradePlans, keyed by a digest of the analysis inputs
+ANALYSIS_CACHE = TTLCache("analysis", ttl=ANALYSIS_CACHE_TTL, maxsize=256)
+# Kalshi /events list pages trimmed to the requested categories, keyed by (URL incl. cursor, categories);
+# per-event market lists from the /markets fallback, keyed by event ticker
+EVENT_LIST_CACHE = TTLCache("kalshi_events", ttl=KALSHI_LIST_CACHE_TTL, maxsize=256)
+EVENT_MARKETS_CACHE = TTLCache("kalshi_event_markets", ttl=KALSHI_DETAIL_CACHE_TTL, maxsize=4096)
+
+_FETCH_LOCKS: Dict[tuple, asyncio.Lock] = {}
+
+
+async def _cached_fetch(cache: TTLCache, key, fetch, ttl_for=None):
+    """
+    Return cache[key], or await fetch() and store its (non-None) result.
+    Concurrent misses for the same key share one fetch instead of stampeding the upstream API.
+    """
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    
+    lock_key = (cache.name, key)
+    lock = _FETCH_LOCKS.setdefault(lock_key, asyncio.Lock())
+    try:
+        async with lock:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            data = await fetch()
+            if data is not None:
+                cache.set(key, data, ttl=ttl_for(data) if ttl_for else None)
+            return data
+    finally:
+        # Late arrivals re-check the cache first, so dropping the lock here is safe
+        if not lock.locked():
+            _FETCH_LOCKS.pop(lock_key, None)
 
 
 # ==========================================
@@ -101,33 +395,51 @@ class ArbitrageOpportunity(BaseModel):
 # ==========================================
 # 📈 FEATURE 1: REAL-TIME CHART HISTORY
 # ==========================================
+def _fetch_history(ticker: str, period: str, interval: str) -> List[ChartDataPoint]:
+    """Blocking yfinance history download + conversion to chart points. Run off the event loop."""
+    stock = yf.Ticker(ticker)
+    hist = stock.history(period=period, interval=interval)
+    
+    if hist.empty:
+        return []
+
+    # Format the whole index and pull the Close column in one shot instead of iterrows()
+    time_fmt = '%Y-%m-%d' if interval not in ['1h', '15m'] else '%H:%M'
+    times = hist.index.strftime(time_fmt).tolist()
+    prices = hist['Close'].to_numpy(dtype=float).tolist()
+    
+    # Trusted yfinance floats: skip per-field validation
+    return [ChartDataPoint.model_construct(time=t, price=p) for t, p in zip(times, prices)]
+
+
 @app.get("/get_stock_history", response_model=List[ChartDataPoint])
 async def get_stock_history(ticker: str, period: str = "1mo", interval: str = "1d"):
     """
     Fetches historical data for the chart using yfinance.
+    Responses are cached per (ticker, period, interval); intraday series expire faster.
     """
+    cache_key = f"{ticker.upper()}:{period}:{interval}"
+    cached = HISTORY_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period, interval=interval)
-        
-        if hist.empty:
-            return []
-
-        chart_data = []
-        for date, row in hist.iterrows():
-            time_str = date.strftime('%Y-%m-%d') if interval not in ['1h', '15m'] else date.strftime('%H:%M')
-            chart_data.append(ChartDataPoint(time=time_str, price=row['Close']))
-            
-        return chart_data
+        chart_data = await _run_yf(_fetch_history, ticker, period, interval)
     except Exception as e:
         print(f"Chart Data Error: {e}")
         return []
     
+    if chart_data:
+        ttl = HISTORY_CACHE_TTL_INTRADAY if interval in INTRADAY_INTERVALS else HISTORY_CACHE_TTL_DAILY
+        HISTORY_CACHE.set(cache_key, chart_data, ttl=ttl)
+    return chart_data
+    
 class ThoughtStep(BaseModel):
     """Individual reasoning step from Gemini's thought process"""
     step_number: int
     thought: str
     timestamp: str
+    search_query: Optional[str] = None  # If this step triggered a search
 
 
 class StockTradePlan(BaseModel):
@@ -151,60 +463,12 @@ class StockTradePlan(BaseModel):
 # ==========================================
 # 🧠 FEATURE 2: THE AI ANALYST (Analyze Stock)
 # ==========================================
-
-
-# ==========================================
-# 🧠 ENHANCED FEATURE: MULTI-MODEL AI ANALYST
-# ==========================================
-@app.post("/analyze_stock", response_model=StockTradePlan)
-async def analyze_stock(ticker: str, chart_image: UploadFile = File(None)):
-    """
-    🚀 GEMINI 3 MULTI-MODEL ORCHESTRATION + THOUGHT SIGNATURES
-    
-    Architecture:
-    1. TRIAGE (Gemini 3 Flash): Fast sentiment scan to determine priority
-    2. DEEP ANALYSIS (Gemini 3 Pro): Full analysis with Thought Signatures
-    3. AUDIT TRAIL: Capture complete reasoning chain for transparency
-    
-    This demonstrates:
-    - Strategic model selection (Flash for speed, Pro for depth)
-    - Thought Signatures for explainable AI decisions
-    - Real-time data grounding via web search
-    """
-    
-    print(f"🔍 [ORCHESTRATOR] Analyzing {ticker} with Gemini 3 family...")
-    
-    if not client:
-        raise HTTPException(500, "Gemini client not initialized")
-    
-    # ==========================================
-    # STEP 1: FETCH REAL MARKET DATA
-    # ==========================================
-    news_summary = "No news data available."
-    current_price = 0.0
-    recent_news = []
-    
-    try:
-        stock = yf.Ticker(ticker)
-        current_price = stock.fast_info.last_price
-        
-        if hasattr(stock, 'news') and stock.news:
-            recent_news = [n.get('title', '') for n in stock.news[:3]]
-            news_summary = " | ".join(recent_news)
-    except Exception as e:
-        print(f"⚠️ Data Fetch Error: {e}")
-        raise HTTPException(500, f"Failed to fetch data for {ticker}")
-    
-    # ==========================================
-    # STEP 2: TRIAGE with Gemini 3 Flash (FAST)
-    # ==========================================
-    print(f"⚡ [FLASH] Running fast triage scan...")
-    
-    triage_prompt = f"""
+# Prompt templates, built once at import (str.format_map slots; literal braces doubled)
+_TRIAGE_TMPL = """
     You are a rapid market sentiment analyzer. Analyze {ticker} and provide a QUICK triage assessment.
     
-    Current Price: ${current_price:.2f}
-    Recent News: {news_summary}
+    Current Price: ${price:.2f}
+    Recent News: {news}
     
     Respond with ONE word sentiment: BULLISH, BEARISH, or NEUTRAL
     Then in 1 sentence explain why.
@@ -212,34 +476,15 @@ async def analyze_stock(ticker: str, chart_image: UploadFile = File(None)):
     Format: SENTIMENT | Reason
     Example: BULLISH | Strong earnings beat with positive forward guidance
     """
-    
-    try:
-        triage_response = client.models.generate_content(
-            model="gemini-3-flash-preview",  # FAST model for triage
-            contents=triage_prompt
-        )
-        
-        triage_text = triage_response.candidates[0].content.parts[0].text.strip()
-        print(f"⚡ [FLASH] Triage result: {triage_text}")
-        
-    except Exception as e:
-        print(f"⚠️ Flash triage failed: {e}")
-        triage_text = "NEUTRAL | Unable to determine sentiment"
-    
-    # ==========================================
-    # STEP 3: DEEP ANALYSIS with Gemini 3 Pro + THOUGHT SIGNATURES
-    # ==========================================
-    print(f"🧠 [PRO] Running deep analysis with Thought Signatures...")
-    
-    # Prepare comprehensive analysis prompt
-    analysis_prompt = f"""
+
+_ANALYSIS_TMPL = """
     You are a Senior Technical Analyst with 20+ years of experience. Perform a comprehensive trade analysis for {ticker}.
     
     MARKET CONTEXT:
     - Ticker: {ticker}
-    - Current Price: ${current_price:.2f}
-    - Recent News Headlines: {news_summary}
-    - Flash Triage Assessment: {triage_text}
+    - Current Price: ${price:.2f}
+    - Recent News Headlines: {news}
+    - Flash Triage Assessment: {triage}
     
     YOUR TASK:
     Analyze this stock and provide specific trading recommendations. Think step-by-step about:
@@ -247,9 +492,9 @@ async def analyze_stock(ticker: str, chart_image: UploadFile = File(None)):
     2. What are the key technical levels (support/resistance)?
     3. What is the risk/reward ratio at current levels?
     4. What should the trade action be (BUY/SELL/HOLD)?
-    5. What are SPECIFIC price targets based on ${current_price:.2f}?
+    5. What are SPECIFIC price targets based on ${price:.2f}?
     
-    CRITICAL: Base all price targets on the CURRENT PRICE of ${current_price:.2f}
+    CRITICAL: Base all price targets on the CURRENT PRICE of ${price:.2f}
     - Entry Zone: Should be within ±2% of current price
     - Stop Loss: Should be 3-5% below entry for BUY, 3-5% above for SELL
     - Take Profit: Should be 5-10% from entry
@@ -264,12 +509,181 @@ async def analyze_stock(ticker: str, chart_image: UploadFile = File(None)):
         "reasoning": "Detailed explanation of the trade setup"
     }}
     """
+
+
+def _fetch_price(ticker: str) -> float:
+    """Blocking yfinance last-price lookup, served from PRICE_CACHE when fresh. Run off the event loop."""
+    key = ticker.upper()
+    price = PRICE_CACHE.get(key)
+    if price is None:
+        # Fresh Ticker on purpose: instances memoize fast_info, so a reused one never refreshes
+        price = yf.Ticker(ticker).fast_info.last_price
+        if price is not None:
+            PRICE_CACHE.set(key, price)
+    return price
+
+
+def _fetch_news_summary(ticker: str) -> tuple:
+    """Blocking Yahoo headlines lookup: (latest 3 headlines, joined summary), served from NEWS_CACHE when fresh."""
+    key = ticker.upper()
+    cached = NEWS_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    stock = yf.Ticker(ticker)
+    recent_news = []
+    if hasattr(stock, 'news') and stock.news:
+        recent_news = [n.get('title', '') for n in stock.news[:3]]
+    news_summary = " | ".join(recent_news) if recent_news else "No news data available."
+    
+    NEWS_CACHE.set(key, (recent_news, news_summary))
+    return recent_news, news_summary
+
+
+def _fetch_quote(ticker: str) -> tuple:
+    """Blocking yfinance lookup: (last price, latest 3 headlines, news summary). Run off the event loop."""
+    current_price = _fetch_price(ticker)
+    recent_news, news_summary = _fetch_news_summary(ticker)
+    return current_price, recent_news, news_summary
+
+
+async def _prepare_chart_part(chart_image: Optional[UploadFile]) -> tuple:
+    """
+    Turn the optional chart upload into (prompt part, Files API name) so it can overlap with the
+    market data fetch. Small images are sent inline (name None); large ones are streamed to the
+    Gemini Files API from the spooled upload instead of being read fully into memory.
+    """
+    if chart_image is None:
+        return None, None
+    
+    mime_type = chart_image.content_type or "image/png"
+    if not mime_type.startswith("image/"):
+        raise HTTPException(400, f"chart_image must be an image, got {mime_type}")
+    
+    if chart_image.size and chart_image.size > CHART_INLINE_MAX_BYTES:
+        async with GEMINI_SEM:
+            client = _require_client()
+            
+            async def upload():
+                chart_image.file.seek(0)  # A retried attempt must resend the whole file
+                return await client.aio.files.upload(
+                    file=chart_image.file,
+                    config=types.UploadFileConfig(mime_type=mime_type),
+                )
+            
+            uploaded = await _gemini_request(upload)
+        part = types.Part.from_uri(file_uri=uploaded.uri, mime_type=uploaded.mime_type or mime_type)
+        return part, uploaded.name
+    
+    image_bytes = await chart_image.read()
+    if not image_bytes:
+        return None, None
+    return types.Part.from_bytes(data=image_bytes, mime_type=mime_type), None
+
+
+async def _delete_uploaded_file(name: str):
+    """Throttled, best-effort client.aio.files.delete; a failed cleanup never fails the request"""
+    try:
+        async with GEMINI_SEM:
+            client = _require_client()
+            await _gemini_request(lambda: client.aio.files.delete(name=name))
+    except Exception as e:
+        logger.warning("⚠️ Failed to delete uploaded chart %s: %s", name, e)
+
+
+# ==========================================
+# 🧠 ENHANCED FEATURE: MULTI-MODEL AI ANALYST
+# ==========================================
+async def _analyze_stock_plan(ticker: str, current_price: float, news_summary: str, chart_part: Optional[types.Part]) -> StockTradePlan:
+    """Steps 2-6 of /analyze_stock: analysis cache, Flash triage, streamed Pro analysis"""
+    # Identical inputs produce an identical (billed) prompt: serve a recent plan instead.
+    # Chart uploads are part of the prompt too, so multimodal requests are never cached.
+    analysis_key = None
+    if chart_part is None:
+        analysis_key = hashlib.blake2b(
+            f"{ticker.upper()}|{round(current_price, 2)}|{news_summary}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        cached_plan = ANALYSIS_CACHE.get(analysis_key)
+        if cached_plan is not None:
+            print(f"♻️ [CACHE] Reusing recent analysis for {ticker}")
+            return cached_plan
+    
+    # ==========================================
+    # STEP 2: TRIAGE with Gemini 3 Flash (FAST)
+    # ==========================================
+    print(f"⚡ [FLASH] Running fast triage scan...")
+    
+    triage_prompt = _TRIAGE_TMPL.format_map({"ticker": ticker, "price": current_price, "news": news_summary})
+    
+    triage_ok = False
+    try:
+        triage_response = await _gemini_generate(
+            model="gemini-3-flash-preview",  # FAST model for triage
+            contents=triage_prompt
+        )
+        
+        triage_text = triage_response.candidates[0].content.parts[0].text.strip()
+        triage_ok = True
+        print(f"⚡ [FLASH] Triage result: {triage_text}")
+        
+    except Exception as e:
+        print(f"⚠️ Flash triage failed: {e}")
+        triage_text = "NEUTRAL | Unable to determine sentiment"
+    
+    # Cascade: a real NEUTRAL verdict from Flash means no edge worth a Pro call -> HOLD.
+    # A failed or off-format triage (sentiment None) or an attached chart (Flash never sees
+    # the image) still gets the deep pass.
+    triage_sentiment, triage_reason = _parse_triage_line(triage_text)
+    if triage_ok and triage_sentiment == "NEUTRAL" and chart_part is None:
+        print(f"⚡ [FLASH] NEUTRAL triage, skipping deep analysis")
+        plan = StockTradePlan(
+            ticker=ticker,
+            action="HOLD",
+            entry_zone=str(current_price),
+            stop_loss=str(current_price * 0.95),
+            take_profit=str(current_price * 1.05),
+            confidence_score=0.5,
+            reasoning_trace=triage_reason or "Flash triage found no directional edge",
+            current_price=current_price,
+            triage_model="gemini-3-flash",
+            analysis_model="gemini-3-flash",
+            triage_sentiment=triage_text,
+            reasoning_audit="Deep analysis skipped: Flash triage returned NEUTRAL"
+        )
+        ANALYSIS_CACHE.set(analysis_key, plan)
+        return plan
+    
+    # ==========================================
+    # STEP 3: DEEP ANALYSIS with Gemini 3 Pro + THOUGHT SIGNATURES
+    # ==========================================
+    print(f"🧠 [PRO] Running deep analysis with Thought Signatures...")
+    
+    # Prepare comprehensive analysis prompt
+    analysis_prompt = _ANALYSIS_TMPL.format_map({
+        "ticker": ticker,
+        "price": current_price,
+        "news": news_summary,
+        "triage": triage_text,
+    })
     
     # Add chart image if provided (multimodal capability)
     prompt_parts = [analysis_prompt]
+    if chart_part is not None:
+        prompt_parts.append(chart_part)
   
-    # Generate with Thought Signatures enabled
-    analysis_response = client.models.generate_content(
+    # ==========================================
+    # STEP 4: STREAM + EXTRACT THOUGHT SIGNATURES
+    # ==========================================
+    thought_chain: List[ThoughtStep] = []
+    reasoning_audit_parts = []
+    response_text_parts = []
+    step_num = 1
+    
+    print(f"🔍 [AUDIT] Streaming analysis and extracting thought signatures...")
+    
+    # Generate with Thought Signatures enabled; thoughts are recorded as chunks arrive
+    analysis_stream = _gemini_generate_stream(
         model="gemini-3-pro-preview",  # DEEP model with reasoning
         contents=prompt_parts,
         config=types.GenerateContentConfig(
@@ -277,48 +691,40 @@ async def analyze_stock(ticker: str, chart_image: UploadFile = File(None)):
             temperature=0.3,  # Lower temperature for more deterministic trading advice
         )
     )
-
     
-    # ==========================================
-    # STEP 4: EXTRACT THOUGHT SIGNATURES
-    # ==========================================
-    thought_chain: List[ThoughtStep] = []
-    reasoning_audit_parts = []
-    
-    print(f"🔍 [AUDIT] Extracting thought signatures...")
-    
-    for candidate in analysis_response.candidates:
-        step_num = 1
-        for part in candidate.content.parts:
-            # Extract thought signature if present
-            if hasattr(part, 'thought') and part.thought:
+    async for chunk in analysis_stream:
+        if not chunk.candidates or not chunk.candidates[0].content:
+            continue
+        # Single pass per part: thoughts feed the audit trail, everything else is answer text
+        for part in chunk.candidates[0].content.parts or []:
+            if not part.text:
+                continue
+            # Extract thought signature if present (part.thought is a flag, the text is on the part)
+            if part.thought:
                 thought_step = ThoughtStep(
                     step_number=step_num,
-                    thought=part.thought.text,
+                    thought=part.text,
                     timestamp=datetime.now(timezone.utc).isoformat()
                 )
                 thought_chain.append(thought_step)
-                reasoning_audit_parts.append(f"Step {step_num}: {part.thought.text}")
+                reasoning_audit_parts.append(f"Step {step_num}: {part.text}")
+                print(f"  💭 Thought {step_num}: {part.text[:80]}...")
                 step_num += 1
-                print(f"  💭 Thought {step_num-1}: {part.thought.text[:80]}...")
+            else:
+                response_text_parts.append(part.text)
     
     # Create human-readable audit trail
     reasoning_audit = "\n".join(reasoning_audit_parts) if reasoning_audit_parts else "No thought signatures captured (model may not have used them for this query)"
     
     # ==========================================
-    # STEP 5: PARSE JSON RESPONSE
+    # STEP 5: PARSE JSON RESPONSE (aggregated across stream chunks)
     # ==========================================
     json_data = {}
     
-    for candidate in analysis_response.candidates:
-        for part in candidate.content.parts:
-            if part.text:
-                # Clean potential markdown formatting
-                clean_text = part.text.replace("```json", "").replace("```", "").strip()
-                json_data = json.loads(clean_text)
-                print(f"✅ [PARSE] Successfully parsed analysis response")
-                break
-              
+    response_text = "".join(response_text_parts)
+    if response_text:
+        json_data = _extract_json(response_text)
+        print(f"✅ [PARSE] Successfully parsed analysis response")
     
     # ==========================================
     # STEP 6: VALIDATE & BUILD RESPONSE
@@ -342,7 +748,7 @@ async def analyze_stock(ticker: str, chart_image: UploadFile = File(None)):
     
     print(f"✅ [COMPLETE] Analysis complete with {len(thought_chain)} thought steps")
     
-    return StockTradePlan(
+    plan = StockTradePlan(
         ticker=ticker,
         action=action,
         entry_zone=str(entry),
@@ -361,6 +767,150 @@ async def analyze_stock(ticker: str, chart_image: UploadFile = File(None)):
         thought_chain=thought_chain,
         reasoning_audit=reasoning_audit
     )
+    
+    if analysis_key:
+        ANALYSIS_CACHE.set(analysis_key, plan)
+    return plan
+
+
+@app.post("/analyze_stock", response_model=StockTradePlan)
+@limit_in_flight(ANALYZE_MAX_IN_FLIGHT)
+async def analyze_stock(ticker: str, chart_image: UploadFile = File(None)):
+    """
+    🚀 GEMINI 3 MULTI-MODEL ORCHESTRATION + THOUGHT SIGNATURES
+    
+    Architecture:
+    1. TRIAGE (Gemini 3 Flash): Fast sentiment scan to determine priority
+    2. DEEP ANALYSIS (Gemini 3 Pro): Full analysis with Thought Signatures
+    3. AUDIT TRAIL: Capture complete reasoning chain for transparency
+    
+    This demonstrates:
+    - Strategic model selection (Flash for speed, Pro for depth)
+    - Thought Signatures for explainable AI decisions
+    - Real-time data grounding via web search
+    """
+    
+    print(f"🔍 [ORCHESTRATOR] Analyzing {ticker} with Gemini 3 family...")
+    
+    _require_client()
+    
+    # ==========================================
+    # STEP 1: FETCH REAL MARKET DATA (+ chart upload, concurrently)
+    # ==========================================
+    quote, chart = await asyncio.gather(
+        _run_yf(_fetch_quote, ticker),
+        _prepare_chart_part(chart_image),
+        return_exceptions=True,
+    )
+    
+    # An uploaded chart is deleted once the analysis is over, even if the quote fetch failed
+    uploaded_name = None if isinstance(chart, BaseException) else chart[1]
+    try:
+        for result in (chart, quote):
+            if isinstance(result, HTTPException):
+                raise result
+            if isinstance(result, Exception):
+                print(f"⚠️ Data Fetch Error: {result}")
+                raise HTTPException(500, f"Failed to fetch data for {ticker}")
+            if isinstance(result, BaseException):  # Cancellation
+                raise result
+        
+        current_price, _, news_summary = quote
+        return await _analyze_stock_plan(ticker, current_price, news_summary, chart[0])
+    finally:
+        if uploaded_name:
+            await _delete_uploaded_file(uploaded_name)
+
+
+# ==========================================
+# ⚡ BATCH TRIAGE (one Flash call for many tickers)
+# ==========================================
+class TriageResult(BaseModel):
+    ticker: str
+    current_price: Optional[float] = None
+    sentiment: str  # "BULLISH" | "BEARISH" | "NEUTRAL"
+    reason: str
+
+
+def _parse_triage_line(text: str) -> tuple:
+    """Split a 'SENTIMENT | Reason' triage line; an unrecognised sentiment comes back as None"""
+    sentiment, _, reason = text.partition("|")
+    sentiment = sentiment.strip().strip("*").upper()
+    if sentiment not in TRIAGE_SENTIMENTS:
+        sentiment = None
+    return sentiment, reason.strip()
+
+
+@app.get("/triage_batch", response_model=List[TriageResult])
+async def triage_batch(tickers: str = Query(..., description=f"Comma-separated tickers (max {TRIAGE_BATCH_MAX})")):
+    """
+    ⚡ Flash triage for a whole watchlist in ONE model call.
+    
+    Saves N-1 requests against the RPM limit compared to calling /analyze_stock per ticker.
+    """
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers.split(",") if t.strip()))
+    if not symbols:
+        raise HTTPException(400, "No tickers provided")
+    if len(symbols) > TRIAGE_BATCH_MAX:
+        raise HTTPException(400, f"At most {TRIAGE_BATCH_MAX} tickers per batch")
+    
+    _require_client()
+    
+    print(f"⚡ [FLASH] Batch triage for {len(symbols)} tickers...")
+    
+    quotes = await asyncio.gather(
+        *[_run_yf(_fetch_quote, t) for t in symbols],
+        return_exceptions=True,
+    )
+    
+    prices: Dict[str, Optional[float]] = {}
+    context_lines = []
+    for symbol, quote in zip(symbols, quotes):
+        if isinstance(quote, Exception):
+            print(f"⚠️ Data Fetch Error ({symbol}): {quote}")
+            prices[symbol] = None
+            context_lines.append(f"{symbol} (price unavailable)")
+            continue
+        price, _, news = quote
+        prices[symbol] = price
+        if price is None:
+            context_lines.append(f"{symbol} (price unavailable)")
+            continue
+        context_lines.append(f"{symbol} (Current Price: ${price:.2f}; Recent News: {news})")
+    
+    triage_prompt = (
+        "You are a rapid market sentiment analyzer. Give a QUICK triage assessment for EACH ticker below.\n"
+        "Respond with exactly one line per ticker, nothing else:\n"
+        "TICKER | SENTIMENT | Reason\n"
+        "SENTIMENT is ONE word: BULLISH, BEARISH, or NEUTRAL. Reason is 1 sentence.\n"
+        "Example: AAPL | BULLISH | Strong earnings beat with positive forward guidance\n\n"
+        "TICKERS:\n" + "\n".join(context_lines)
+    )
+    
+    parsed: Dict[str, tuple] = {}
+    try:
+        triage_response = await _gemini_generate(
+            model="gemini-3-flash-preview",  # FAST model for triage
+            contents=triage_prompt
+        )
+        for line in (triage_response.text or "").splitlines():
+            symbol, sep, rest = line.partition("|")
+            symbol = symbol.strip().strip("*").upper()
+            if sep and symbol in prices and symbol not in parsed:
+                parsed[symbol] = _parse_triage_line(rest)
+    except Exception as e:
+        print(f"⚠️ Flash batch triage failed: {e}")
+    
+    results = []
+    for symbol in symbols:
+        sentiment, reason = parsed.get(symbol, (None, "Unable to determine sentiment"))
+        results.append(TriageResult(
+            ticker=symbol,
+            current_price=prices[symbol],
+            sentiment=sentiment or "NEUTRAL",
+            reason=reason,
+        ))
+    return results
 
 
 @app.get("/get_news_trading_candidates", response_model=List[FundamentalCandidate])
@@ -377,7 +927,7 @@ async def get_news_trading_candidates(budget: float):
     candidates_data = []
     
     try:
-        response = client.models.generate_content(
+        response = await _gemini_generate(
             model="gemini-3-pro-preview",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -394,11 +944,10 @@ async def get_news_trading_candidates(budget: float):
                 if part.text:
                     print(part.text)
                     try:
-                        clean_text = part.text.replace("```json", "").replace("```", "").strip()
-                        data = json.loads(clean_text)
+                        data = _extract_json(part.text, "[")
                         if isinstance(data, list):
                             candidates_data = data
-                    except Exception as e:
+                    except ValueError as e:
                         print(f"error 1 {e}")
                         continue
     except Exception as e:
@@ -410,16 +959,23 @@ async def get_news_trading_candidates(budget: float):
     if not candidates_data:
         return []
     
-    for item in candidates_data:
+    # Look up every candidate's price concurrently instead of one round trip at a time
+    prices = await asyncio.gather(
+        *[_run_yf(_fetch_price, item.get('ticker')) for item in candidates_data],
+        return_exceptions=True,
+    )
+    
+    for item, price in zip(candidates_data, prices):
         ticker = item.get('ticker')
         try:
-            stock = yf.Ticker(ticker)
-            price = stock.fast_info.last_price
+            if isinstance(price, Exception):
+                raise price
             
             if 2.0 < price <= budget:
+                # ticker/headline/sentiment come from model output: keep validation so bad rows drop out below
                 final_output.append(FundamentalCandidate(
                     ticker=ticker,
-                    price=round(price, 2),
+                    price=round(float(price), 2),
                     news_catalyst=item.get("news_headline", "News Catalyst"),
                     sentiment=item.get("sentiment", "Neutral")
                 ))
@@ -463,37 +1019,18 @@ class Strategy1Response(BaseModel):
     total_found: int
     trades: List[TradePlan]
 
-# Legacy models
-class StockTradePlan(BaseModel):
-    ticker: str
-    action: str
-    entry_zone: str
-    stop_loss: str
-    take_profit: str
-    confidence_score: float
-    reasoning_trace: str
-    current_price: float 
-
-class ChartDataPoint(BaseModel):
-    time: str
-    price: float
-
-class FundamentalCandidate(BaseModel):
-    ticker: str
-    price: float
-    news_catalyst: str
-    sentiment: str 
-
 # ==========================================
 # 🧮 UTILITY FUNCTIONS
 # ==========================================
 
+@functools.lru_cache(maxsize=128)
 def calculate_kalshi_fee(price_cents: float) -> float:
     """Calculate Kalshi taker fee: 0.07 × P × (1-P)"""
     p = price_cents / 100
     fee = 0.07 * p * (1 - p) * 100
     return round(fee, 2)
 
+@functools.lru_cache(maxsize=128)
 def calculate_position_size(entry_price: float, stop_loss: float, bankroll: float = 1000, max_risk_pct: float = 0.02) -> tuple:
     """Calculate position size based on risk management"""
     risk_per_contract_cents = entry_price - stop_loss
@@ -510,161 +1047,318 @@ def calculate_position_size(entry_price: float, stop_loss: float, bankroll: floa
     
     return num_contracts, round(actual_risk, 2)
 
+# Kalshi quotes are whole cents, so the fee for every possible price is computed once at import
+_FEE_LUT = np.fromiter((calculate_kalshi_fee(p) for p in range(101)), dtype=np.float64, count=101)
+
+def calculate_kalshi_fee_vec(prices_cents: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_kalshi_fee over an array of prices (cents); whole cents are a _FEE_LUT lookup"""
+    prices = np.asarray(prices_cents, dtype=np.float64)
+    cents = prices.astype(np.intp)
+    if np.all((cents == prices) & (cents >= 0) & (cents <= 100)):
+        return _FEE_LUT[cents]
+    p = prices / 100
+    return np.round(0.07 * p * (1 - p) * 100, 2)
+
+def calculate_position_size_vec(entry_price: np.ndarray, stop_loss: np.ndarray, bankroll: float = 1000, max_risk_pct: float = 0.02) -> tuple:
+    """Vectorized calculate_position_size: (contracts array, actual risk dollars array)"""
+    risk_per_contract_dollars = (np.asarray(entry_price, dtype=np.float64) - np.asarray(stop_loss, dtype=np.float64)) / 100
+    max_risk_dollars = bankroll * max_risk_pct
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        num_contracts = np.where(risk_per_contract_dollars > 0, np.trunc(max_risk_dollars / risk_per_contract_dollars), 0)
+    
+    num_contracts = np.minimum(num_contracts, 50).astype(np.int64)
+    actual_risk = num_contracts * risk_per_contract_dollars
+    
+    return num_contracts, np.round(actual_risk, 2)
+
 # ==========================================
 # 🎯 STRATEGY 1 (From previous implementation)
 # ==========================================
 
-@app.get("/strategy1/scan", response_model=Strategy1Response)
-async def scan_strategy1_opportunities(
-    categories: str = Query("Crypto,Financial", description="Comma-separated: Crypto, Financial, Economics"),
-    only_0dte: bool = Query(False, description="Only show contracts expiring today"),
-    bankroll: float = Query(1000, description="Your bankroll for position sizing")
-):
-    """🎯 STRATEGY 1: Safe-Bet opportunities (88-98¢ range)"""
-    print(f"🎯 Strategy 1 Scan: {STRATEGY_1_MIN_PRICE}-{STRATEGY_1_MAX_PRICE}¢")
-    categories ="Crypto,Financial"
-    only_0dte = False
-    trades: List[TradePlan] = []
-    category_list = [c.strip().upper() for c in categories.split(",")]
-    
-    CATEGORY_MAP = {
-        "CRYPTO": ["CRYPTO", "CRYPTOCURRENCY"],
-        "FINANCIAL": ["FINANCIAL", "FINANCE", "FINANCIALS"],
-        "ECONOMICS": ["ECONOMICS", "ECONOMY"],
-    }
-    
+_CATEGORY_MAP = {
+    "CRYPTO": ("CRYPTO", "CRYPTOCURRENCY"),
+    "FINANCIAL": ("FINANCIAL", "FINANCE", "FINANCIALS"),
+    "ECONOMICS": ("ECONOMICS", "ECONOMY"),
+}
+
+
+def _resolve_categories(category_key: tuple) -> frozenset:
+    """Expand requested category names (sorted, upper-cased) into every Kalshi spelling they match"""
     allowed_categories = set()
-    for cat in category_list:
-        for key, values in CATEGORY_MAP.items():
+    for cat in category_key:
+        for key, values in _CATEGORY_MAP.items():
             if cat in values or cat == key:
                 allowed_categories.update(values)
                 allowed_categories.add(key)
+    return frozenset(allowed_categories)
+
+
+# The scan currently always requests Crypto + Financial: resolve that once at import
+_ALLOWED_BY_REQUEST: Dict[tuple, frozenset] = {
+    ("CRYPTO", "FINANCIAL"): _resolve_categories(("CRYPTO", "FINANCIAL")),
+}
+
+
+def _parse_kalshi_ts(ts: str) -> datetime:
+    """Parse a Kalshi timestamp; the usual 'YYYY-MM-DDTHH:MM:SSZ' form is sliced directly"""
+    if len(ts) == 20 and ts[19] == 'Z':
+        return datetime(int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                        int(ts[11:13]), int(ts[14:16]), int(ts[17:19]), tzinfo=timezone.utc)
+    return datetime.fromisoformat(ts.replace('Z', '+00:00'))
+
+
+def _event_markets_ttl(markets: list) -> float:
+    """Cache TTL for one event's markets: shorter when any market closes today"""
+    today = datetime.now(timezone.utc).date()
+    for m in markets:
+        close_time = m.get('close_time')
+        try:
+            if close_time and _parse_kalshi_ts(close_time).date() == today:
+                return KALSHI_DETAIL_CACHE_TTL_0DTE
+        except (TypeError, ValueError):
+            continue
+    return KALSHI_DETAIL_CACHE_TTL
+
+
+def _build_event_trades(event_info: dict, detail_data: dict, only_0dte: bool, bankroll: float, now: datetime) -> List[TradePlan]:
+    """Turn one Kalshi event ({"event": ..., "markets": [...]}) into Strategy 1 TradePlans (markets inside the price band)"""
+    et = event_info["ticker"]
+    now_ts = now.timestamp()
+    now_date = now.date()
+    event_data = detail_data.get('event', {})
+    markets = detail_data.get('markets', [])
+    trades: List[TradePlan] = []
     
-    try:
-        filtered_events = []
-        current_url = f"{KALSHI_API_URL}/events?limit=200&status=open"
+    if not markets:
+        return trades
+    
+    # Price-band filter for all markets at once; only survivors reach the per-market Python below
+    yes = np.fromiter((m.get('yes_ask') or 0 for m in markets), dtype=np.float64, count=len(markets))
+    no = np.fromiter((m.get('no_ask') or 0 for m in markets), dtype=np.float64, count=len(markets))
+    
+    # Fractional (dollar) quotes -> cents, truncated like int()
+    yes = np.where((yes > 0) & (yes <= 1), np.trunc(yes * 100), yes)
+    no = np.where((no > 0) & (no <= 1), np.trunc(no * 100), no)
+    
+    yes_mask = (yes >= STRATEGY_1_MIN_PRICE) & (yes <= STRATEGY_1_MAX_PRICE)
+    no_mask = (no >= STRATEGY_1_MIN_PRICE) & (no <= STRATEGY_1_MAX_PRICE)
+    
+    # Expiry gating stays per market (timestamp parsing); everything numeric after it is batched
+    keep: List[int] = []
+    expiries: List[Optional[str]] = []
+    hours_list: List[float] = []
+    zero_dte_list: List[bool] = []
+    
+    for i in np.flatnonzero(yes_mask | no_mask).tolist():
+        m = markets[i]
+        expiry_time = m.get('close_time') or m.get('expiration_time')
+        
+        try:
+            expiry = _parse_kalshi_ts(expiry_time)
+            hours_to_exp = max(0.0, (expiry.timestamp() - now_ts) / 3600)
+            is_zero_dte = expiry.date() == now_date
+        
+        except (TypeError, ValueError):
+            hours_to_exp = 24.0
+            is_zero_dte = False
+        
+        if only_0dte and not is_zero_dte:
+            continue
+        
+        keep.append(i)
+        expiries.append(expiry_time)
+        hours_list.append(hours_to_exp)
+        zero_dte_list.append(is_zero_dte)
+    
+    if not keep:
+        return trades
+    
+    idx = np.array(keep)
+    is_yes = yes_mask[idx]
+    zero_dte = np.array(zero_dte_list)
+    
+    entry = np.where(is_yes, yes[idx], no[idx])
+    stop = np.maximum(1, np.round(entry * np.where(zero_dte, 0.5, 0.4)))
+    profit = 100 - entry
+    loss = entry - stop
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rr = np.where(loss > 0, profit / loss, 0.0)
+    fee = calculate_kalshi_fee_vec(entry)
+    net_profit = profit - fee
+    contracts, max_risk = calculate_position_size_vec(entry, stop, bankroll)
+    
+    category = event_info.get("category", "")
+    settlement_source = event_data.get('settlement_source_url') or 'Kalshi'
+    
+    # Back to native Python scalars once, for the whole batch
+    sides = np.where(is_yes, "YES", "NO").tolist()
+    entry, stop, profit, loss = entry.tolist(), stop.tolist(), profit.tolist(), loss.tolist()
+    rr, fee, net_profit = rr.tolist(), fee.tolist(), net_profit.tolist()
+    contracts, max_risk = contracts.tolist(), max_risk.tolist()
+    
+    for j, i in enumerate(keep):
+        m = markets[i]
+        
+        # Every field is built locally with its declared type, so skip re-validation
+        trade = TradePlan.model_construct(
+            market_id=m.get('ticker') or '',
+            event_ticker=et,
+            title=m.get('title') or '',
+            category=category,
+            side=sides[j],
+            entry_price=entry[j],
+            exit_price=100.0,
+            stop_loss=stop[j],
+            potential_profit_cents=profit[j],
+            potential_loss_cents=loss[j],
+            risk_reward_ratio=round(rr[j], 2),
+            expiry_time=expiries[j],
+            hours_to_expiry=round(hours_list[j], 2),
+            is_0dte=zero_dte_list[j],
+            fee_per_contract=fee[j],
+            net_profit_after_fees=round(net_profit[j], 2),
+            settlement_source=settlement_source,
+            implied_win_rate=entry[j],
+            suggested_contracts=contracts[j],
+            max_risk_dollars=max_risk[j]
+        )
         
+        trades.append(trade)
+    
+    return trades
+
+
+async def _scan_strategy1(categories: str, only_0dte: bool, bankroll: float) -> Strategy1Response:
+    """Run the Strategy 1 scan; shared by /strategy1/scan and /strategy1/verify_top3"""
+    logger.info("🎯 Strategy 1 Scan: %s-%s¢", STRATEGY_1_MIN_PRICE, STRATEGY_1_MAX_PRICE)
+    categories ="Crypto,Financial"
+    only_0dte = False
+    trades: List[TradePlan] = []
+    category_key = tuple(sorted(c.strip().upper() for c in categories.split(",")))
+    allowed_categories = _ALLOWED_BY_REQUEST.get(category_key) or _resolve_categories(category_key)
+    
+    client: httpx.AsyncClient = app.state.kalshi_client
+    scan_now = datetime.now(timezone.utc)
+    
+    # Pipeline: the producer walks the event-list cursor while workers are already
+    # fetching markets for the events found so far, so the two phases overlap
+    queue: asyncio.Queue = asyncio.Queue(maxsize=KALSHI_QUEUE_MAXSIZE)
+    
+    async def fetch_json(url: str, **kwargs) -> Optional[dict]:
+        res = await client.get(url, **kwargs)
+        return res.json() if res.status_code == 200 else None
+    
+    async def fetch_markets(tickers: str) -> Optional[dict]:
+        """All markets for up to KALSHI_MARKETS_BATCH comma-joined event tickers, all pages"""
+        markets = []
+        # No status filter: same market set as the nested list payload (and the old /events/{ticker})
+        params = {"event_ticker": tickers, "limit": 1000}
         while True:
-            res = requests.get(current_url, timeout=15)
-            if res.status_code != 200:
-                break
-            
-            data = res.json()
-            events = data.get("events", [])
-            cursor = data.get("cursor", "")
-            
-            for e in events:
-                cat = e.get("category", "").upper()
-                if cat in allowed_categories:
-                    print("in")
-                    filtered_events.append({
-                        "ticker": e.get("event_ticker"),
+            data = await fetch_json(f"{KALSHI_API_URL}/markets", params=params)
+            if data is None:
+                return None
+            markets.extend(data.get("markets", []))
+            cursor = data.get("cursor") or ""
+            if not cursor:
+                return {"markets": markets}
+            params = {**params, "cursor": cursor}
+    
+    async def fetch_page(url: str) -> Optional[dict]:
+        """One /events page, trimmed to the requested categories before it is cached"""
+        data = await fetch_json(url, timeout=15)
+        if data is None:
+            return None
+        # /events has no category filter (only series_ticker, one series per call),
+        # so categories are screened here and other categories' markets are never kept
+        events = [
+            e for e in data.get("events", [])
+            if e.get("event_ticker") and (e.get("category") or "").upper() in allowed_categories
+        ]
+        return {"events": events, "cursor": data.get("cursor", "")}
+    
+    def add_trades(event_info: dict, markets: list):
+        try:
+            detail_data = {"event": event_info, "markets": markets}
+            trades.extend(_build_event_trades(event_info, detail_data, only_0dte, bankroll, scan_now))
+        except Exception as e:
+            logger.debug("Skipping event %s: %s", event_info["ticker"], e)
+    
+    async def producer():
+        batch: List[dict] = []
+        current_url = f"{KALSHI_API_URL}/events?limit=200&status=open&with_nested_markets=true"
+        try:
+            while True:
+                url = current_url
+                data = await _cached_fetch(EVENT_LIST_CACHE, (url, category_key), lambda: fetch_page(url))
+                if data is None:
+                    break
+                
+                cursor = data["cursor"]
+                
+                for e in data["events"]:
+                    event_info = {
+                        "ticker": e["event_ticker"],
                         "category": e.get("category"),
-                    })
+                        "settlement_source_url": e.get("settlement_source_url"),
+                    }
+                    # The nested markets already carry the quotes and close times a trade needs;
+                    # only events listed without a markets key cost a /markets fetch (an empty list is an answer)
+                    if "markets" in e:
+                        add_trades(event_info, e["markets"])
+                        continue
+                    cached = EVENT_MARKETS_CACHE.get(event_info["ticker"])
+                    if cached is not None:
+                        add_trades(event_info, cached)
+                        continue
+                    # Only uncached events are batched, so one event changing never shifts the others' cache keys
+                    batch.append(event_info)
+                    if len(batch) == KALSHI_MARKETS_BATCH:
+                        await queue.put(batch)
+                        batch = []
+                    
+                if cursor == "":
+                    break
                 
-            if cursor == "":
-                break
-            
-            current_url = f"{KALSHI_API_URL}/events?limit=200&status=open&cursor={cursor}"
-        
-        for event_info in filtered_events:
-            et = event_info["ticker"]
-            if not et:
-                continue
-            
+                current_url = f"{KALSHI_API_URL}/events?limit=200&status=open&with_nested_markets=true&cursor={cursor}"
+        except Exception as e:
+            logger.error("❌ Strategy 1 Error: %s", e)
+        finally:
+            if batch:
+                await queue.put(batch)
+            for _ in range(KALSHI_DETAIL_WORKERS):
+                await queue.put(None)
+    
+    async def worker():
+        while (batch := await queue.get()) is not None:
+            tickers = ",".join(event_info["ticker"] for event_info in batch)
             try:
-                detail_res = requests.get(f"{KALSHI_API_URL}/events/{et}", timeout=10)
-                if detail_res.status_code != 200:
+                data = await fetch_markets(tickers)
+                if data is None:
                     continue
                 
-                detail_data = detail_res.json()
-                event_data = detail_data.get('event', {})
-                markets = detail_data.get('markets', [])
+                # One response covers the whole batch; regroup and cache the markets per event
+                by_event: Dict[str, list] = {}
+                for m in data["markets"]:
+                    by_event.setdefault(m.get("event_ticker"), []).append(m)
                 
-                for m in markets:
-
-                    test = m.get('title')
-                    yes_ask = m.get('yes_ask') or 0
-                    no_ask = m.get('no_ask') or 0
-                
-                    if 0 < yes_ask <= 1:
-                        yes_ask = int(yes_ask * 100)
-                    if 0 < no_ask <= 1:
-                        no_ask = int(no_ask * 100)
-                    
-                    selected_side = None
-                    entry_price = 0
-                    
-                    if STRATEGY_1_MIN_PRICE <= yes_ask <= STRATEGY_1_MAX_PRICE:
-                        selected_side = "YES"
-                        entry_price = yes_ask
-                        print("YES")
-                    elif STRATEGY_1_MIN_PRICE <= no_ask <= STRATEGY_1_MAX_PRICE:
-                        selected_side = "NO"
-                        entry_price = no_ask
-                        print("NO")
-                    if not selected_side:
-                        continue
-                    
-                    expiry_time = m.get('close_time') or m.get('expiration_time')
-                    
-                    try:
-                        expiry = datetime.fromisoformat(expiry_time.replace('Z', '+00:00'))
-                        now = datetime.now(timezone.utc)
-                        hours_to_exp = max(0, (expiry - now).total_seconds() / 3600)
-                        is_zero_dte = expiry.date() == now.date()
-                    
-                    except:
-                        hours_to_exp = 24
-                        is_zero_dte = False
-                    
-                    if only_0dte and not is_zero_dte:
-                        continue
-                    
-                    stop_loss = max(1, round(entry_price * 0.5 if is_zero_dte else entry_price * 0.4))
-                    potential_profit = 100 - entry_price
-                    potential_loss = entry_price - stop_loss
-                    rr_ratio = potential_profit / potential_loss if potential_loss > 0 else 0
-                    
-                    fee = calculate_kalshi_fee(entry_price)
-                    net_profit = potential_profit - fee
-                    
-                    num_contracts, max_risk = calculate_position_size(entry_price, stop_loss, bankroll)
-                    
-                    trade = TradePlan(
-                        market_id=m.get('ticker', ''),
-                        event_ticker=et,
-                        title=m.get('title', ''),
-                        category=event_info.get("category", ""),
-                        side=selected_side,
-                        entry_price=entry_price,
-                        exit_price=100,
-                        stop_loss=stop_loss,
-                        potential_profit_cents=potential_profit,
-                        potential_loss_cents=potential_loss,
-                        risk_reward_ratio=round(rr_ratio, 2),
-                        expiry_time=expiry_time,
-                        hours_to_expiry=round(hours_to_exp, 2),
-                        is_0dte=is_zero_dte,
-                        fee_per_contract=fee,
-                        net_profit_after_fees=round(net_profit, 2),
-                        settlement_source=event_data.get('settlement_source_url', 'Kalshi'),
-                        implied_win_rate=entry_price,
-                        suggested_contracts=num_contracts,
-                        max_risk_dollars=max_risk
-                    )
-                    
-                    trades.append(trade)
-                    
+                for event_info in batch:
+                    markets = by_event.get(event_info["ticker"], [])
+                    EVENT_MARKETS_CACHE.set(event_info["ticker"], markets, ttl=_event_markets_ttl(markets))
+                    if markets:
+                        add_trades(event_info, markets)
             except Exception as e:
                 continue
-        
-    except Exception as e:
-        print(f"❌ Strategy 1 Error: {e}")
     
-    trades.sort(key=lambda x: (x.hours_to_expiry, -x.net_profit_after_fees))
+    await asyncio.gather(producer(), *(worker() for _ in range(KALSHI_DETAIL_WORKERS)))
     
-    return Strategy1Response(
+    # Soonest expiry first, then highest net profit: one compiled lexsort instead of a per-trade key tuple
+    if trades:
+        hours = np.fromiter((t.hours_to_expiry for t in trades), dtype=np.float64, count=len(trades))
+        net_profit = np.fromiter((t.net_profit_after_fees for t in trades), dtype=np.float64, count=len(trades))
+        trades = [trades[i] for i in np.lexsort((-net_profit, hours))]
+    
+    return Strategy1Response.model_construct(
         scan_time=datetime.now(timezone.utc).isoformat(),
         price_range=f"{STRATEGY_1_MIN_PRICE}-{STRATEGY_1_MAX_PRICE}¢",
         categories=list(allowed_categories),
@@ -672,12 +1366,17 @@ async def scan_strategy1_opportunities(
         trades=trades
     )
 
-class ThoughtStep(BaseModel):
-    """Individual reasoning step from Gemini's thought process"""
-    step_number: int
-    thought: str
-    timestamp: str
-    search_query: Optional[str] = None  # If this step triggered a search
+
+@app.get("/strategy1/scan", response_model=Strategy1Response)
+async def scan_strategy1_opportunities(
+    categories: str = Query("Crypto,Financial", description="Comma-separated: Crypto, Financial, Economics"),
+    only_0dte: bool = Query(False, description="Only show contracts expiring today"),
+    bankroll: float = Query(1000, description="Your bankroll for position sizing")
+):
+    """🎯 STRATEGY 1: Safe-Bet opportunities (88-98¢ range)"""
+    result = await _scan_strategy1(categories, only_0dte, bankroll)
+    # Returning a Response skips FastAPI's response_model re-validation; the model still documents the schema
+    return ORJSONResponse(result.model_dump())
 
 class Strategy1VerifiedTrade(BaseModel):
     """Enhanced with Thought Signatures audit trail"""
@@ -714,48 +1413,16 @@ class Strategy1VerifyResponse(BaseModel):
     summary: str
 
 
-async def verify_strategy1_trade(trade: TradePlan) -> Strategy1VerifiedTrade:
-    """
-    🚀 ENHANCED VERIFICATION WITH GEMINI 3 THOUGHT SIGNATURES
-    
-    This is the MAIN DEMO FEATURE for the hackathon.
-    
-    Process:
-    1. Extract settlement source from Kalshi market
-    2. Use Gemini 3 Pro + Thought Signatures to:
-       - Determine which data source to check (CoinGecko, Yahoo Finance, BLS, etc.)
-       - Use Google Search to retrieve current real-world data
-       - Compare to Kalshi's resolution threshold
-       - Calculate true probability vs market price
-       - Compute edge and make recommendation
-    3. Capture complete reasoning chain via Thought Signatures
-    4. Return full audit trail for transparency
-    
-    This demonstrates:
-    ✅ Agentic multi-step reasoning
-    ✅ Real-time web search grounding
-    ✅ Thought Signatures for explainable AI
-    ✅ Protecting users from mispriced markets
-    """
-    
-    print(f"🔍 [VERIFY] Starting enhanced verification for: {trade.title[:60]}...")
-    
-    if not client:
-        raise HTTPException(500, "Gemini client not initialized")
-    
-    # ==========================================
-    # STEP 1: BUILD VERIFICATION PROMPT
-    # ==========================================
-    
-    verification_prompt = f"""
+# Verification prompt, built once at import (str.format_map slots; literal braces doubled)
+_VERIFY_TMPL = """
 You are a quantitative analyst verifying prediction market opportunities.
 
 MARKET DETAILS:
-- Title: {trade.title}
-- Settlement Source: {trade.settlement_source}
-- Current Market Price: {trade.entry_price}¢ for {trade.side}
-- Market Implied Probability: {trade.implied_win_rate:.1f}%
-- Time to Expiry: {trade.hours_to_expiry:.1f} hours
+- Title: {title}
+- Settlement Source: {settlement_source}
+- Current Market Price: {entry_price}¢ for {side}
+- Market Implied Probability: {implied_win_rate:.1f}%
+- Time to Expiry: {hours_to_expiry:.1f} hours
 
 YOUR TASK - THINK STEP BY STEP:
 
@@ -771,7 +1438,7 @@ Step 2: Use Google Search to find the CURRENT value
 - Extract the exact current value
 
 Step 3: Extract the threshold from the settlement rule
-- Parse "{trade.settlement_source}" carefully
+- Parse "{settlement_source}" carefully
 - Identify the exact threshold or condition
 
 Step 4: Calculate the true probability
@@ -808,15 +1475,56 @@ OUTPUT STRICT JSON:
     "time_sensitivity": "Description of time urgency"
 }}
 """
+
+async def verify_strategy1_trade(trade: TradePlan) -> Strategy1VerifiedTrade:
+    """
+    🚀 ENHANCED VERIFICATION WITH GEMINI 3 THOUGHT SIGNATURES
+    
+    This is the MAIN DEMO FEATURE for the hackathon.
+    
+    Process:
+    1. Extract settlement source from Kalshi market
+    2. Use Gemini 3 Pro + Thought Signatures to:
+       - Determine which data source to check (CoinGecko, Yahoo Finance, BLS, etc.)
+       - Use Google Search to retrieve current real-world data
+       - Compare to Kalshi's resolution threshold
+       - Calculate true probability vs market price
+       - Compute edge and make recommendation
+    3. Capture complete reasoning chain via Thought Signatures
+    4. Return full audit trail for transparency
+    
+    This demonstrates:
+    ✅ Agentic multi-step reasoning
+    ✅ Real-time web search grounding
+    ✅ Thought Signatures for explainable AI
+    ✅ Protecting users from mispriced markets
+    """
+    
+    logger.info("🔍 [VERIFY] Starting enhanced verification for: %s...", trade.title[:60])
+    
+    _require_client()
+    
+    # ==========================================
+    # STEP 1: BUILD VERIFICATION PROMPT
+    # ==========================================
+    
+    verification_prompt = _VERIFY_TMPL.format_map({
+        "title": trade.title,
+        "settlement_source": trade.settlement_source,
+        "entry_price": trade.entry_price,
+        "side": trade.side,
+        "implied_win_rate": trade.implied_win_rate,
+        "hours_to_expiry": trade.hours_to_expiry,
+    })
     
     # ==========================================
     # STEP 2: CALL GEMINI 3 PRO WITH THOUGHT SIGNATURES + GOOGLE SEARCH
     # ==========================================
     
-    print(f"🧠 [PRO] Activating Thought Signatures + Google Search...")
+    logger.info("🧠 [PRO] Activating Thought Signatures + Google Search...")
     
     try:
-        response = client.models.generate_content(
+        response = await _gemini_generate(
             model="gemini-3-pro-preview",
             contents=verification_prompt,
             config=types.GenerateContentConfig(
@@ -830,25 +1538,26 @@ OUTPUT STRICT JSON:
             )
         )
     except Exception as e:
-        print(f"❌ [PRO] Verification failed: {e}")
+        logger.error("❌ [PRO] Verification failed: %s", e)
         raise HTTPException(500, f"Verification failed: {e}")
     
     # ==========================================
-    # STEP 3: EXTRACT THOUGHT SIGNATURES
+    # STEP 3: EXTRACT THOUGHT SIGNATURES + PARSE JSON (single pass over the parts)
     # ==========================================
     
     thought_chain: List[ThoughtStep] = []
     reasoning_audit_parts = []
     web_searches = 0
+    result = {}
     
-    print(f"🔍 [AUDIT] Extracting thought signatures and search queries...")
+    logger.debug("🔍 [AUDIT] Extracting thought signatures and search queries...")
     
     for candidate in response.candidates:
         step_num = 1
         for part in candidate.content.parts:
             
             # Check if this part is a thought (boolean flag check)
-            if hasattr(part, 'thought') and part.thought:
+            if part.thought:
                 # ✅ FIX: Use part.text, not part.thought.text
                 thought_text = part.text
                 
@@ -869,40 +1578,30 @@ OUTPUT STRICT JSON:
                 search_indicator = " [🔍 Search]" if search_query else ""
                 reasoning_audit_parts.append(f"Step {step_num}{search_indicator}: {thought_text}")
                 
-                print(f"  💭 Thought {step_num}{search_indicator}: {thought_text[:100]}...")
+                logger.debug("  💭 Thought %s%s: %s...", step_num, search_indicator, thought_text[:100])
                 step_num += 1
             
+            # First answer part that parses becomes the result
+            elif part.text and not result:
+                try:
+                    result = _extract_json(part.text)
+                    logger.debug("✅ [PARSE] Successfully parsed verification response")
+                except ValueError as e:
+                    logger.warning("⚠️ JSON parse error: %s", e)
+            
             # Extract search results (if available)
-            if hasattr(part, 'executable_code') and part.executable_code:
-                print(f"  🔍 Search executed: {part.executable_code.language}")
+            if part.executable_code:
+                logger.debug("  🔍 Search executed: %s", part.executable_code.language)
     
     reasoning_audit = "\n".join(reasoning_audit_parts) if reasoning_audit_parts else "Standard verification (no explicit thoughts captured)"
     
-    print(f"✅ [AUDIT] Captured {len(thought_chain)} reasoning steps, {web_searches} web searches")
-    
-    # ==========================================
-    # STEP 4: PARSE JSON RESPONSE
-    # ==========================================
-    
-    result = {}
-    
-    for candidate in response.candidates:
-        for part in candidate.content.parts:
-            if part.text:
-                try:
-                    clean_text = part.text.replace("```json", "").replace("```", "").strip()
-                    result = json.loads(clean_text)
-                    print(f"✅ [PARSE] Successfully parsed verification response")
-                    break
-                except json.JSONDecodeError as e:
-                    print(f"⚠️ JSON parse error: {e}")
-                    continue
+    logger.info("✅ [AUDIT] Captured %d reasoning steps, %d web searches", len(thought_chain), web_searches)
     
     if not result:
         raise HTTPException(500, "Failed to parse verification response")
     
     # ==========================================
-    # STEP 5: CALCULATE EDGE & VALIDATE
+    # STEP 4: CALCULATE EDGE & VALIDATE
     # ==========================================
     
     ai_prob = result.get("ai_true_probability", 50.0)
@@ -914,10 +1613,10 @@ OUTPUT STRICT JSON:
     
     # Validate recommendation matches edge
     if edge >= 5 and result["recommendation"] != "EXECUTE":
-        print(f"⚠️ Correcting recommendation: edge {edge:.1f}% should be EXECUTE")
+        logger.warning("⚠️ Correcting recommendation: edge %.1f%% should be EXECUTE", edge)
         result["recommendation"] = "EXECUTE"
     elif edge < 0 and result["recommendation"] != "SKIP":
-        print(f"⚠️ Correcting recommendation: edge {edge:.1f}% should be SKIP")
+        logger.warning("⚠️ Correcting recommendation: edge %.1f%% should be SKIP", edge)
         result["recommendation"] = "SKIP"
     
     # Position sizing based on confidence and edge
@@ -932,10 +1631,10 @@ OUTPUT STRICT JSON:
     
     adjusted_risk = adjusted_contracts * trade.max_risk_dollars / base_contracts
     
-    print(f"✅ [COMPLETE] Verification complete: {result['recommendation']} | Edge: {edge:.1f}% | Confidence: {result['confidence']}")
+    logger.info("✅ [COMPLETE] Verification complete: %s | Edge: %.1f%% | Confidence: %s", result['recommendation'], edge, result['confidence'])
     
     # ==========================================
-    # STEP 6: BUILD ENHANCED RESPONSE
+    # STEP 5: BUILD ENHANCED RESPONSE
     # ==========================================
     
     return Strategy1VerifiedTrade(
@@ -984,10 +1683,10 @@ async def verify_top3_strategy1(
     
     This is the main endpoint for finding the best trades!
     """
-    print(f"🏆 Finding Top 3 Strategy 1 Opportunities...")
+    logger.info("🏆 Finding Top 3 Strategy 1 Opportunities...")
     
     # Step 1: Get all opportunities
-    scan_response = await scan_strategy1_opportunities(categories, only_0dte, bankroll)
+    scan_response = await _scan_strategy1(categories, only_0dte, bankroll)
     trades = scan_response.trades
     
     if not trades:
@@ -998,17 +1697,28 @@ async def verify_top3_strategy1(
             summary="No opportunities found in the current scan."
         )
     
-    print(f"📊 Found {len(trades)} trades to analyze")
+    logger.info("📊 Found %d trades to analyze", len(trades))
     
-    # Step 2: Verify each trade (limit to first 10 to avoid rate limits)
-    verified_trades: List[Strategy1VerifiedTrade] = []
+    # Step 2: Verify the candidates concurrently (GEMINI_RATE paces the calls; the semaphore bounds the fan-out)
     trades_to_verify = trades[:3]  # Limit to avoid rate limits
+    verify_sem = asyncio.Semaphore(VERIFY_CONCURRENCY)
+    
+    async def bounded_verify(i: int, trade: TradePlan) -> Strategy1VerifiedTrade:
+        async with verify_sem:
+            logger.info("🔍 Verifying %d/%d: %s...", i + 1, len(trades_to_verify), trade.title[:50])
+            return await verify_strategy1_trade(trade)
     
-    for i, trade in enumerate(trades_to_verify):
-        print(f"🔍 Verifying {i+1}/{len(trades_to_verify)}: {trade.title[:50]}...")
-        verified = await verify_strategy1_trade(trade)
-        verified_trades.append(verified)
-        time.sleep(1)  # Rate limit protection
+    results = await asyncio.gather(
+        *(bounded_verify(i, t) for i, t in enumerate(trades_to_verify)),
+        return_exceptions=True,
+    )
+    
+    verified_trades: List[Strategy1VerifiedTrade] = []
+    for trade, result in zip(trades_to_verify, results):
+        if isinstance(result, Exception):
+            logger.warning("⚠️ Verification failed for %s: %s", trade.market_id, result)
+            continue
+        verified_trades.append(result)
     
     if not verified_trades:
         return Strategy1VerifyResponse(
@@ -1064,7 +1774,7 @@ async def verify_top3_strategy1(
     if top_3 and top_3[0].recommendation == "EXECUTE":
         summary += f" Best opportunity: {top_3[0].trade.title[:40]}... with {top_3[0].edge:.1f}% edge."
     
-    print(f"✅ Top 3 identified: {[vt.trade.title[:30] for vt in top_3]}")
+    logger.info("✅ Top 3 identified: %s", [vt.trade.title[:30] for vt in top_3])
     
     return Strategy1VerifyResponse(
         scan_time=datetime.now(timezone.utc).isoformat(),
@@ -1076,9 +1786,14 @@ async def verify_top3_strategy1(
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "time": datetime.now(timezone.utc).isoformat()}
+    return {
+        "status": "ok",
+        "time": datetime.now(timezone.utc).isoformat(),
+        "caches": {name: cache.stats() for name, cache in CACHES.items()},
+    }
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # loop/http "auto" pick uvloop + httptools when installed (uvicorn[standard]), asyncio/h11 otherwise
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto", http="auto")